@@ -918,17 +918,54 @@ bitmap_decompress(uint8 * output, int width, int height, uint8* input, int size,
 
 /* *INDENT-ON* */
 
+/* swap the red and blue channels of a decompressed 24bpp bitmap in place */
+static void
+swap_rgb24(uint8 * buffer, Py_ssize_t length)
+{
+	uint8 *end = buffer + length - (length % 3);
+	uint8 tmp;
+
+	while (buffer < end)
+	{
+		tmp = buffer[0];
+		buffer[0] = buffer[2];
+		buffer[2] = tmp;
+		buffer += 3;
+	}
+}
+
 static PyObject*
 bitmap_decompress_wrapper(PyObject* self, PyObject* args)
 {
 	Py_buffer output, input;
 	int width = 0, height = 0, bpp = 0;
+	int rv;
 
-	if (!PyArg_ParseTuple(args, "s*iis*i", &output, &width, &height, &input, &bpp))
+	if (!PyArg_ParseTuple(args, "w*iis*i", &output, &width, &height, &input, &bpp))
 		return NULL;
 
-	if(bitmap_decompress((uint8*)output.buf, width, height, (uint8*)input.buf, input.len, bpp) == False)
+	if (output.len < (Py_ssize_t) width * height * bpp)
+	{
+		PyBuffer_Release(&output);
+		PyBuffer_Release(&input);
+		PyErr_SetString(PyExc_ValueError, "output buffer is too small for the bitmap");
 		return NULL;
+	}
+
+	rv = bitmap_decompress((uint8*)output.buf, width, height, (uint8*)input.buf, input.len, bpp);
+
+	/* the 24bpp decoder outputs BGR, but callers expect RGB */
+	if (rv != False && bpp == 3)
+		swap_rgb24((uint8*)output.buf, (Py_ssize_t) width * height * 3);
+
+	PyBuffer_Release(&output);
+	PyBuffer_Release(&input);
+
+	if (rv == False)
+	{
+		PyErr_SetString(PyExc_ValueError, "invalid RLE compressed bitmap");
+		return NULL;
+	}
 
 	Py_RETURN_NONE;
 }
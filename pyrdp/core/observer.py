@@ -70,7 +70,10 @@ class CompositeObserver:
 class CompositeObserverCall:
     """
     Object that calls back to the CompositeObserver when it is called.
+    One of these is created for every observer call, so it uses slots to keep instances small and cheap to create.
     """
+    __slots__ = ("composite", "item")
+
     def __init__(self, composite, item):
         self.composite = composite
         self.item = item
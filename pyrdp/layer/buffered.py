@@ -24,7 +24,7 @@ class BufferedLayer(IntermediateLayer):
         in a row.
         This should always return 0 if the buffer is empty.
         """
-        if self.buffer == b"":
+        if not self.buffer:
             return 0
 
         try:
@@ -239,9 +239,11 @@ class MCSMITM:
 
         self.statCounter.increment(STAT.MCS, STAT.MCS_INPUT)
 
-        if pdu.channelID in self.serverChannels:
+        channel = self.clientChannels.get(pdu.channelID)
+
+        if channel is not None:
             self.statCounter.increment(STAT.MCS_INPUT_ + str(pdu.channelID))
-            self.clientChannels[pdu.channelID].recv(pdu.payload)
+            channel.recv(pdu.payload)
 
     def onSendDataIndication(self, pdu: MCSSendDataIndicationPDU):
         """
@@ -251,9 +253,11 @@ class MCSMITM:
 
         self.statCounter.increment(STAT.MCS, STAT.MCS_OUTPUT)
 
-        if pdu.channelID in self.clientChannels:
+        channel = self.serverChannels.get(pdu.channelID)
+
+        if channel is not None:
             self.statCounter.increment(STAT.MCS_OUTPUT_ + str(pdu.channelID))
-            self.serverChannels[pdu.channelID].recv(pdu.payload)
+            channel.recv(pdu.payload)
 
     def onClientDisconnectProviderUltimatum(self, pdu: MCSDisconnectProviderUltimatumPDU):
         """
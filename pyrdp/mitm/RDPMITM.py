@@ -35,7 +35,7 @@ from pyrdp.mitm.TCPMITM import TCPMITM
 from pyrdp.mitm.VirtualChannelMITM import VirtualChannelMITM
 from pyrdp.mitm.X224MITM import X224MITM
 from pyrdp.mitm.PlayerLayerSet import TwistedPlayerLayerSet
-from pyrdp.recording import FileLayer, RecordingFastPathObserver, RecordingSlowPathObserver
+from pyrdp.recording import AsyncFileLayer, RecordingFastPathObserver, RecordingSlowPathObserver
 
 
 class RDPMITM:
@@ -88,6 +88,13 @@ class RDPMITM:
         self.channelMITMs = {}
         """MITM components for virtual channels"""
 
+        self.channelBuilders = {
+            MCSChannelName.IO: self.buildIOChannel,
+            MCSChannelName.CLIPBOARD: self.buildClipboardChannel,
+            MCSChannelName.DEVICE_REDIRECTION: self.buildDeviceChannel,
+        }
+        """Functions that build the MITM components for known channel names"""
+
         serverConnector = self.connectToServer()
         self.tcp = TCPMITM(self.client.tcp, self.server.tcp, self.player.tcp, self.getLog("tcp"), self.state, self.recorder, serverConnector, self.statCounter)
         """TCP MITM component"""
@@ -136,7 +143,7 @@ class RDPMITM:
                             date.microsecond // 1000,
                             self.log.sessionID)
             self.recorder.setRecordFilename(replayFileName)
-            self.recorder.addTransport(FileLayer(self.config.replayDir / replayFileName))
+            self.recorder.addTransport(AsyncFileLayer(self.config.replayDir / replayFileName))
 
         if config.enableCrawler:
             self.crawler: FileCrawlerMITM = FileCrawlerMITM(self.getClientLog(MCSChannelName.DEVICE_REDIRECTION).createChild("crawler"), crawlerLogger, self.config, self.state)
@@ -211,15 +218,11 @@ class RDPMITM:
         channelID = client.channelID
 
         if userID == channelID:
-            self.buildVirtualChannel(client, server)
-        elif self.state.channelMap[channelID] == MCSChannelName.IO:
-            self.buildIOChannel(client, server)
-        elif self.state.channelMap[channelID] == MCSChannelName.CLIPBOARD:
-            self.buildClipboardChannel(client, server)
-        elif self.state.channelMap[channelID] == MCSChannelName.DEVICE_REDIRECTION:
-            self.buildDeviceChannel(client, server)
+            builder = self.buildVirtualChannel
         else:
-            self.buildVirtualChannel(client, server)
+            builder = self.channelBuilders.get(self.state.channelMap.get(channelID), self.buildVirtualChannel)
+
+        builder(client, server)
 
     def buildIOChannel(self, client: MCSServerChannel, server: MCSClientChannel):
         """
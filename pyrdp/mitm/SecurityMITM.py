@@ -54,7 +54,7 @@ class SecurityMITM:
         Set the security settings' client random from the security exchange.
         :param pdu: the security exchange
         """
-        clientRandom = RSA(self.state.rc4RSAKey).decrypt(pdu.clientRandom[:: -1])[:: -1]
+        clientRandom = RSA(self.state.rc4RSAKey).decrypt(pdu.clientRandom, "little")
         self.state.securitySettings.setClientRandom(clientRandom)
 
         self.server.sendSecurityExchange(self.state.securitySettings.encryptClientRandom())
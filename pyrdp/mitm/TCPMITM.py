@@ -136,5 +136,9 @@ class TCPMITM:
         self.log.info("Attacker connection closed. %(reason)s", {"reason": reason.value})
 
     def recordConnectionClose(self):
+        """
+        Record the end of the connection and close the recording files.
+        """
         pdu = PlayerConnectionClosePDU(self.recorder.getCurrentTimeStamp())
-        self.recorder.record(pdu, pdu.header)
\ No newline at end of file
+        self.recorder.record(pdu, pdu.header)
+        self.recorder.close()
\ No newline at end of file
@@ -36,6 +36,8 @@ class X224MITM:
         self.connector = connector
         self.startTLSCallback = startTLSCallback
         self.originalRequest: typing.Optional[NegotiationRequestPDU] = None
+        self.negotiationRequestParser = NegotiationRequestParser()
+        self.negotiationResponseParser = NegotiationResponseParser()
 
         self.client.createObserver(
             onConnectionRequest = self.onConnectionRequest,
@@ -55,7 +57,7 @@ class X224MITM:
         :param pdu: the connection request
         """
 
-        parser = NegotiationRequestParser()
+        parser = self.negotiationRequestParser
         self.originalRequest = parser.parse(pdu.payload)
         self.state.requestedProtocols = self.originalRequest.requestedProtocols
 
@@ -102,7 +104,7 @@ class X224MITM:
         # X224 Response
         protocols = NegotiationProtocols.SSL if self.originalRequest.tlsSupported else NegotiationProtocols.NONE
 
-        parser = NegotiationResponseParser()
+        parser = self.negotiationResponseParser
         response = parser.parse(pdu.payload)
         if isinstance(response, NegotiationFailurePDU):
             self.log.info("The server failed the negotiation. Error: %(error)s", {"error": NegotiationFailureCode.getMessage(response.failureCode)})
@@ -6,13 +6,12 @@
 
 from typing import Dict, Optional
 
-from Crypto.PublicKey import RSA
-
 from pyrdp.enum import NegotiationProtocols, ParserMode
 from pyrdp.layer import FastPathLayer, SecurityLayer, TLSSecurityLayer
 from pyrdp.parser import createFastPathParser
 from pyrdp.pdu import ClientChannelDefinition
 from pyrdp.security import RC4CrypterProxy, SecuritySettings
+from pyrdp.security.crypto import RSA
 
 
 class RDPMITMState:
@@ -36,7 +35,7 @@ class RDPMITMState:
         self.channelMap: Dict[int, str] = {}
         """Dictionary of channel names to channel IDs"""
 
-        self.rc4RSAKey = RSA.generate(2048)
+        self.rc4RSAKey = RSA.generateKey(2048)
         """The RSA key for the RC4 key exchange"""
 
         self.crypters = {
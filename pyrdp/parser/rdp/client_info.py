@@ -4,6 +4,7 @@
 # Licensed under the GPLv3 or later.
 #
 
+import struct
 from io import BytesIO
 
 from pyrdp.core import decodeUTF16LE, encodeUTF16LE, StrictStream, Uint16LE, Uint32LE
@@ -18,6 +19,8 @@ class ClientInfoParser(Parser):
     See https://msdn.microsoft.com/en-us/library/cc240475.aspx
     """
 
+    LENGTHS_STRUCT = struct.Struct("<5H")
+
     def parse(self, data: bytes) -> ClientInfoPDU:
         """
         Decode a Client Info PDU from bytes.
@@ -67,41 +70,15 @@ class ClientInfoParser(Parser):
         nullByteCount = 1 if hasNullBytes else 0
         unicodeMultiplier = 2 if isUnicode else 0
 
-        domain = pdu.domain + "\x00" * nullByteCount
-        username = pdu.username + "\x00" * nullByteCount
-        password = pdu.password + "\x00" * nullByteCount
-        alternateShell = pdu.alternateShell + "\x00" * nullByteCount
-        workingDir = pdu.workingDir + "\x00" * nullByteCount
-
-        if isUnicode:
-            domain = encodeUTF16LE(domain)
-            username = encodeUTF16LE(username)
-            password = encodeUTF16LE(password)
-            alternateShell = encodeUTF16LE(alternateShell)
-            workingDir = encodeUTF16LE(workingDir)
-        else:
-            domain = domain.encode()
-            username = username.encode()
-            password = password.encode()
-            alternateShell = alternateShell.encode()
-            workingDir = workingDir.encode()
-
-        domainLength = len(domain) - nullByteCount * unicodeMultiplier
-        usernameLength = len(username) - nullByteCount * unicodeMultiplier
-        passwordLength = len(password) - nullByteCount * unicodeMultiplier
-        alternateShellLength = len(alternateShell) - nullByteCount * unicodeMultiplier
-        workingDirLength = len(workingDir) - nullByteCount * unicodeMultiplier
-
-        stream.write(Uint16LE.pack(domainLength))
-        stream.write(Uint16LE.pack(usernameLength))
-        stream.write(Uint16LE.pack(passwordLength))
-        stream.write(Uint16LE.pack(alternateShellLength))
-        stream.write(Uint16LE.pack(workingDirLength))
-        stream.write(domain)
-        stream.write(username)
-        stream.write(password)
-        stream.write(alternateShell)
-        stream.write(workingDir)
+        encode = encodeUTF16LE if isUnicode else str.encode
+        fields = [
+            encode(field + "\x00" * nullByteCount)
+            for field in (pdu.domain, pdu.username, pdu.password, pdu.alternateShell, pdu.workingDir)
+        ]
+
+        # domain, username, password, alternate shell and working dir lengths, all written at once
+        stream.write(self.LENGTHS_STRUCT.pack(*(len(field) - nullByteCount * unicodeMultiplier for field in fields)))
+        stream.write(b"".join(fields))
 
         if pdu.extraInfo is not None:
             extraInfoBytes = self.writeExtraInfo(pdu.extraInfo)
@@ -9,7 +9,6 @@ import typing
 from io import BytesIO
 
 from Crypto.PublicKey import RSA
-from Crypto.Util.number import bytes_to_long, long_to_bytes
 
 from pyrdp.core import decodeUTF16LE, encodeUTF16LE, StrictStream, Uint16LE, Uint32LE, Uint8
 from pyrdp.enum import ColorDepth, ConnectionDataType, ConnectionType, DesktopOrientation, EncryptionLevel, \
@@ -376,8 +375,8 @@ class ServerConnectionParser(Parser):
         modulus = stream.read(keyLength - 8)
         _padding = stream.read(8)
 
-        # Modulus must be reversed because bytes_to_long expects it to be in big endian format
-        modulus = bytes_to_long(modulus[:: -1])
+        # The modulus is stored in little endian format
+        modulus = int.from_bytes(modulus, "little")
         publicExponent = int(publicExponent)
         publicKey = RSA.construct((modulus, publicExponent))
         return publicKey
@@ -482,8 +481,8 @@ class ServerConnectionParser(Parser):
         modulus = publicKey.n
         publicExponent = publicKey.e
 
-        # Modulus must be reversed because bytes_to_long expects it to be in big endian format
-        modulusBytes = long_to_bytes(modulus)[:: -1]
+        # The modulus is stored in little endian format
+        modulusBytes = modulus.to_bytes((modulus.bit_length() + 7) // 8, "little")
 
         stream = BytesIO()
         stream.write(b"RSA1")
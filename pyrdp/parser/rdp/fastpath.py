@@ -13,12 +13,15 @@ from pyrdp.enum import DrawingOrderControlFlags, EncryptionMethod, FastPathInput
 from pyrdp.logging import log
 from pyrdp.parser.parser import Parser
 from pyrdp.parser.rdp.bitmap import BitmapParser
-from pyrdp.parser.rdp.security import BasicSecurityParser
+from pyrdp.parser.rdp.security import BasicSecurityParser, unpackFIPSHeader
 from pyrdp.pdu import FastPathBitmapEvent, FastPathEventRaw, FastPathMouseEvent, FastPathOrdersEvent, FastPathPDU, \
     FastPathScanCodeEvent, SecondaryDrawingOrder
 from pyrdp.pdu.rdp.fastpath import FastPathEvent, FastPathOutputEvent, FastPathUnicodeEvent
 from pyrdp.security import RC4Crypter, RC4CrypterProxy
 
+_FASTPATH_OUTPUT_ENCRYPTED = FastPathSecurityFlags.FASTPATH_OUTPUT_ENCRYPTED
+_FASTPATH_OUTPUT_ENCRYPTED_SECURE_CHECKSUM = FastPathSecurityFlags.FASTPATH_OUTPUT_ENCRYPTED | FastPathSecurityFlags.FASTPATH_OUTPUT_SECURE_CHECKSUM
+
 
 class BasicFastPathParser(BasicSecurityParser):
     def __init__(self, mode: ParserMode):
@@ -155,7 +158,7 @@ class SignedFastPathParser(BasicFastPathParser):
 
         data = stream.read(pduLength - stream.tell())
 
-        if header & FastPathSecurityFlags.FASTPATH_OUTPUT_ENCRYPTED != 0:
+        if header & _FASTPATH_OUTPUT_ENCRYPTED != 0:
             data = self.crypter.decrypt(data)
             self.crypter.addDecryption()
 
@@ -182,7 +185,7 @@ class SignedFastPathParser(BasicFastPathParser):
         return BasicFastPathParser.calculatePDULength(self, pdu) + 8
 
     def getHeaderFlags(self) -> FastPathSecurityFlags:
-        return FastPathSecurityFlags.FASTPATH_OUTPUT_ENCRYPTED | FastPathSecurityFlags.FASTPATH_OUTPUT_SECURE_CHECKSUM
+        return _FASTPATH_OUTPUT_ENCRYPTED_SECURE_CHECKSUM
 
 
 class FIPSFastPathParser(SignedFastPathParser):
@@ -194,9 +197,7 @@ class FIPSFastPathParser(SignedFastPathParser):
         header = Uint8.unpack(stream)
         eventCount = self.parseEventCount(header)
         pduLength = self.parseLength(stream)
-        _fipsLength = Uint16LE.unpack(stream)
-        _version = Uint8.unpack(stream)
-        _padLength = Uint8.unpack(stream)
+        _fipsLength, _version, _padLength = unpackFIPSHeader(stream)
         _signature = stream.read(8)
 
         if eventCount == 0:
@@ -204,7 +205,7 @@ class FIPSFastPathParser(SignedFastPathParser):
 
         data = stream.read(pduLength - stream.tell())
 
-        if header & FastPathSecurityFlags.FASTPATH_OUTPUT_ENCRYPTED != 0:
+        if header & _FASTPATH_OUTPUT_ENCRYPTED != 0:
             data = self.crypter.decrypt(data)
             self.crypter.addDecryption()
 
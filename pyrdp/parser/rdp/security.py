@@ -4,6 +4,7 @@
 # Licensed under the GPLv3 or later.
 #
 
+import struct
 from io import BytesIO
 
 from pyrdp.core import Uint16LE, Uint32LE, Uint8
@@ -12,6 +13,26 @@ from pyrdp.parser.parser import Parser
 from pyrdp.pdu import SecurityExchangePDU, SecurityPDU
 from pyrdp.security import RC4Crypter, RC4CrypterProxy
 
+# Bound at module level because they are checked for every PDU
+_SEC_EXCHANGE_PKT = SecurityFlags.SEC_EXCHANGE_PKT
+_SEC_ENCRYPT = SecurityFlags.SEC_ENCRYPT
+_SEC_ENCRYPT_SECURE_CHECKSUM = SecurityFlags.SEC_ENCRYPT | SecurityFlags.SEC_SECURE_CHECKSUM
+
+# FIPS header: length (Uint16LE), version (Uint8), pad length (Uint8)
+_FIPS_HEADER = struct.Struct("<HBB")
+
+
+def unpackFIPSHeader(stream):
+    """
+    Read the length, version and pad length fields of a FIPS security header in one call.
+    :type stream: BytesIO
+    :return: int, int, int
+    """
+    try:
+        return _FIPS_HEADER.unpack(stream.read(_FIPS_HEADER.size))
+    except struct.error as e:
+        raise ValueError(str(e)) from e
+
 
 class BasicSecurityParser(Parser):
     """
@@ -29,7 +50,7 @@ class BasicSecurityParser(Parser):
         stream = BytesIO(data)
         header = Uint32LE.unpack(stream)
 
-        if header & SecurityFlags.SEC_EXCHANGE_PKT != 0:
+        if header & _SEC_EXCHANGE_PKT != 0:
             return self.parseSecurityExchange(stream, header)
 
         payload = stream.read()
@@ -113,13 +134,13 @@ class SignedSecurityParser(BasicSecurityParser):
         stream = BytesIO(data)
         header = Uint32LE.unpack(stream)
 
-        if header & SecurityFlags.SEC_EXCHANGE_PKT != 0:
+        if header & _SEC_EXCHANGE_PKT != 0:
             return self.parseSecurityExchange(stream, header)
 
         signature = stream.read(8)
         payload = stream.read()
 
-        if header & SecurityFlags.SEC_ENCRYPT != 0:
+        if header & _SEC_ENCRYPT != 0:
             payload = self.crypter.decrypt(payload)
             self.crypter.addDecryption()
 
@@ -128,7 +149,7 @@ class SignedSecurityParser(BasicSecurityParser):
 
     def writeHeader(self, stream, pdu):
         # Make sure the header contains the flags for encryption and salted signatures.
-        header = pdu.header | SecurityFlags.SEC_ENCRYPT | SecurityFlags.SEC_SECURE_CHECKSUM
+        header = pdu.header | _SEC_ENCRYPT_SECURE_CHECKSUM
         Uint32LE.pack(header, stream)
 
     def writeBody(self, stream, pdu):
@@ -159,16 +180,14 @@ class FIPSSecurityParser(SignedSecurityParser):
         stream = BytesIO(data)
         header = Uint32LE.unpack(stream)
 
-        if header & SecurityFlags.SEC_EXCHANGE_PKT != 0:
+        if header & _SEC_EXCHANGE_PKT != 0:
             return self.parseSecurityExchange(stream, header)
 
-        length = Uint16LE.unpack(stream)
-        version = Uint8.unpack(stream)
-        padLength = Uint8.unpack(stream)
+        length, version, padLength = unpackFIPSHeader(stream)
         signature = stream.read(8)
         payload = stream.read()
 
-        if header & SecurityFlags.SEC_ENCRYPT != 0:
+        if header & _SEC_ENCRYPT != 0:
             payload = self.crypter.decrypt(payload)
             self.crypter.addDecryption()
 
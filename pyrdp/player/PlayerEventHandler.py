@@ -4,10 +4,10 @@
 # Licensed under the GPLv3 or later.
 #
 
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from PySide2.QtCore import QObject
-from PySide2.QtGui import QTextCursor
+from PySide2.QtGui import QImage, QTextCursor
 from PySide2.QtWidgets import QTextEdit
 
 from pyrdp.core import decodeUTF16LE, Observer
@@ -35,6 +35,7 @@ class PlayerEventHandler(QObject, Observer):
         self.shiftPressed = False
         self.capsLockOn = False
         self.buffer = b""
+        self.bitmapBuffer = bytearray()
         self.handlers = {
             PlayerPDUType.CLIENT_DATA: self.onClientData,
             PlayerPDUType.CLIENT_INFO: self.onClientInfo,
@@ -121,9 +122,7 @@ class PlayerEventHandler(QObject, Observer):
             self.viewer.resize(bitmapCapability.desktopWidth, bitmapCapability.desktopHeight)
         elif isinstance(pdu, UpdatePDU) and pdu.updateType == SlowPathUpdateType.SLOWPATH_UPDATETYPE_BITMAP:
             updates = BitmapParser().parseBitmapUpdateData(pdu.updateData)
-
-            for bitmap in updates:
-                self.handleBitmap(bitmap)
+            self.handleBitmaps(updates)
         elif isinstance(pdu, InputPDU):
             for event in pdu.events:
                 if isinstance(event, MouseEvent):
@@ -171,8 +170,7 @@ class PlayerEventHandler(QObject, Observer):
         parser = FastPathOutputParser()
         parsedEvent = parser.parseBitmapEvent(event)
 
-        for bitmapData in parsedEvent.bitmapUpdateData:
-            self.handleBitmap(bitmapData)
+        self.handleBitmaps(parsedEvent.bitmapUpdateData)
 
 
     def onFastPathInput(self, pdu: PlayerPDU):
@@ -222,20 +220,45 @@ class PlayerEventHandler(QObject, Observer):
 
 
     def handleBitmap(self, bitmapData: BitmapUpdateData):
+        self.handleBitmaps([bitmapData])
+
+    def handleBitmaps(self, bitmaps: List[BitmapUpdateData]):
+        """
+        Draw all the bitmaps of an update on the viewer at once.
+        """
+        self.viewer.notifyImages(self.convertBitmap(bitmapData) for bitmapData in bitmaps)
+
+    def convertBitmap(self, bitmapData: BitmapUpdateData) -> Tuple[int, int, QImage, int, int]:
+        """
+        Convert a bitmap to the (x, y, image, width, height) tuple expected by the viewer.
+        """
+        width = bitmapData.width
+        height = bitmapData.heigth
+        left = bitmapData.destLeft
+        top = bitmapData.destTop
+
         image = RDPBitmapToQtImage(
-            bitmapData.width,
-            bitmapData.heigth,
+            width,
+            height,
             bitmapData.bitsPerPixel,
             bitmapData.flags & BitmapFlags.BITMAP_COMPRESSION != 0,
-            bitmapData.bitmapData
+            bitmapData.bitmapData,
+            self.getBitmapBuffer(width * height * 4)
         )
 
-        self.viewer.notifyImage(
-            bitmapData.destLeft,
-            bitmapData.destTop,
-            image,
-            bitmapData.destRight - bitmapData.destLeft + 1,
-            bitmapData.destBottom - bitmapData.destTop + 1)
+        return left, top, image, bitmapData.destRight - left + 1, bitmapData.destBottom - top + 1
+
+
+    def getBitmapBuffer(self, size: int) -> bytearray:
+        """
+        Get the buffer used to decompress bitmaps, growing it if needed.
+        Bitmaps are drawn on the viewer as soon as they are converted, so a single buffer can be reused for all of them.
+        :param size: minimum size of the buffer
+        """
+        if len(self.bitmapBuffer) < size:
+            self.bitmapBuffer = bytearray(size)
+
+        return self.bitmapBuffer
 
 
     def onDeviceMapping(self, pdu: PlayerDeviceMappingPDU):
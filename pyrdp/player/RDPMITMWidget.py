@@ -8,9 +8,9 @@ import functools
 import logging
 import platform
 import time
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
-from PySide2.QtCore import QEvent, QObject, Qt
+from PySide2.QtCore import QEvent, QObject, Qt, QTimer
 from PySide2.QtGui import QKeyEvent, QMouseEvent, QWheelEvent
 from PySide2.QtWidgets import QWidget
 
@@ -32,6 +32,18 @@ class RDPMITMWidget(QRemoteDesktop):
 
     KEY_SEQUENCE_DELAY = 0
 
+    # After some testing, it seems like scan codes on Linux are 8 higher than their Windows version.
+    SCAN_CODE_OFFSET = -8 if platform.system() == "Linux" else 0
+
+    # Mouse moves are coalesced and only the last position is sent after this delay, in milliseconds.
+    MOUSE_MOVE_DELAY = 30
+
+    MOUSE_BUTTON_MAPPING = {
+        Qt.MouseButton.LeftButton: MouseButton.LEFT_BUTTON,
+        Qt.MouseButton.RightButton: MouseButton.RIGHT_BUTTON,
+        Qt.MouseButton.MiddleButton: MouseButton.MIDDLE_BUTTON,
+    }
+
     def __init__(self, width: int, height: int, layer: PlayerLayer, parent: Optional[QWidget] = None):
         super().__init__(width, height, parent = parent)
         self.layer = layer
@@ -39,6 +51,11 @@ class RDPMITMWidget(QRemoteDesktop):
         self.log = logging.getLogger(LOGGER_NAMES.PLAYER)
         self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
         self.installEventFilter(self)
+        self.pendingMousePosition: Optional[Tuple[int, int]] = None
+        self.mouseMoveTimer = QTimer(self)
+        self.mouseMoveTimer.setSingleShot(True)
+        self.mouseMoveTimer.setInterval(RDPMITMWidget.MOUSE_MOVE_DELAY)
+        self.mouseMoveTimer.timeout.connect(self.sendMouseMove)
 
 
     def getTimetamp(self) -> int:
@@ -52,7 +69,23 @@ class RDPMITMWidget(QRemoteDesktop):
         if not self.handleEvents or not self.hasFocus():
             return
 
-        x, y = self.getMousePosition(event)
+        # Mouse tracking generates an event for every pixel, so only send the last position every MOUSE_MOVE_DELAY.
+        self.pendingMousePosition = self.getMousePosition(event)
+
+        if not self.mouseMoveTimer.isActive():
+            self.mouseMoveTimer.start()
+
+    def sendMouseMove(self):
+        """
+        Send the last mouse position received, if it was not sent already.
+        """
+        self.mouseMoveTimer.stop()
+
+        if self.pendingMousePosition is None:
+            return
+
+        x, y = self.pendingMousePosition
+        self.pendingMousePosition = None
 
         pdu = PlayerMouseMovePDU(self.layer.getCurrentTimeStamp(), x, y)
         self.layer.sendPDU(pdu)
@@ -66,19 +99,15 @@ class RDPMITMWidget(QRemoteDesktop):
             self.handleMouseButton(event, False)
 
     def handleMouseButton(self, event: QMouseEvent, pressed: bool):
+        # Send pending moves first so the server doesn't see them after the click
+        self.sendMouseMove()
         x, y = self.getMousePosition(event)
-        button = event.button()
+        button = RDPMITMWidget.MOUSE_BUTTON_MAPPING.get(event.button())
 
-        mapping = {
-            Qt.MouseButton.LeftButton: MouseButton.LEFT_BUTTON,
-            Qt.MouseButton.RightButton: MouseButton.RIGHT_BUTTON,
-            Qt.MouseButton.MiddleButton: MouseButton.MIDDLE_BUTTON,
-        }
-
-        if button not in mapping:
+        if button is None:
             return
 
-        pdu = PlayerMouseButtonPDU(self.layer.getCurrentTimeStamp(), x, y, mapping[button], pressed)
+        pdu = PlayerMouseButtonPDU(self.layer.getCurrentTimeStamp(), x, y, button, pressed)
         self.layer.sendPDU(pdu)
 
 
@@ -86,6 +115,7 @@ class RDPMITMWidget(QRemoteDesktop):
         if not self.handleEvents:
             return
 
+        self.sendMouseMove()
         x, y = self.getMousePosition(event)
         delta = event.delta()
         horizontal = event.orientation() == Qt.Orientation.Horizontal
@@ -117,13 +147,7 @@ class RDPMITMWidget(QRemoteDesktop):
             self.handleKeyEvent(event, True)
 
     def handleKeyEvent(self, event: QKeyEvent, released: bool):
-        # After some testing, it seems like scan codes on Linux are 8 higher than their Windows version.
-        if platform.system() == "Linux":
-            offset = -8
-        else:
-            offset = 0
-
-        scanCode = keyboard.findScanCodeForEvent(event) or event.nativeScanCode() + offset
+        scanCode = keyboard.findScanCodeForEvent(event) or event.nativeScanCode() + RDPMITMWidget.SCAN_CODE_OFFSET
         pdu = PlayerKeyboardPDU(self.layer.getCurrentTimeStamp(), scanCode, released, event.key() in keyboard.EXTENDED_KEYS)
         self.layer.sendPDU(pdu)
 
@@ -165,7 +189,6 @@ class RDPMITMWidget(QRemoteDesktop):
 
         def pressCharacter(character: str) -> int:
             pdu = PlayerTextPDU(self.layer.getCurrentTimeStamp(), character, False)
-            print(c)
             self.layer.sendPDU(pdu)
             return RDPMITMWidget.KEY_SEQUENCE_DELAY
 
@@ -188,6 +211,7 @@ class RDPMITMWidget(QRemoteDesktop):
         self.setForwardingState(not controlled)
 
         if not controlled:
+            self.pendingMousePosition = None
             self.sendCurrentScreen()
 
     def setForwardingState(self, shouldForward: bool):
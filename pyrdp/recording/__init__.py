@@ -5,4 +5,4 @@
 #
 
 from pyrdp.recording.observer import RecordingFastPathObserver, RecordingSlowPathObserver
-from pyrdp.recording.recorder import FileLayer, Recorder
+from pyrdp.recording.recorder import AsyncFileLayer, FileLayer, Recorder
@@ -4,8 +4,11 @@
 # Licensed under the GPLv3 or later.
 #
 
+import atexit
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Set, Union
 
 from pyrdp.enum import ParserMode, PlayerPDUType
 from pyrdp.layer import LayerChainItem, PlayerLayer
@@ -33,6 +36,7 @@ class Recorder:
         }
 
         self.topLayers = []
+        self.transports = []
         self.recordFilename = None
 
         for transport in transports:
@@ -46,6 +50,7 @@ class Recorder:
         self.recordFilename = filename
 
     def addTransport(self, transportLayer: LayerChainItem):
+        self.transports.append(transportLayer)
         player = PlayerLayer()
         player.setPrevious(transportLayer)
         self.topLayers.append(player)
@@ -80,6 +85,14 @@ class Recorder:
     def getCurrentTimeStamp(self) -> int:
         return PlayerLayer().getCurrentTimeStamp()
 
+    def close(self):
+        """
+        Close the recording files. Should be called once the recording is over.
+        """
+        for transport in self.transports:
+            if isinstance(transport, FileLayer):
+                transport.close()
+
 
 class FileLayer(LayerChainItem):
     """
@@ -99,4 +112,107 @@ class FileLayer(LayerChainItem):
         if not self.file_descriptor.closed:
             self.file_descriptor.write(data)
         else:
-            log.error("Recording file handle closed, cannot write message: %(message)s", {"message": data})
\ No newline at end of file
+            log.error("Recording file handle closed, cannot write message: %(message)s", {"message": data})
+
+    def close(self):
+        """
+        Close the file.
+        """
+        self.file_descriptor.close()
+
+
+class AsyncFileLayer(FileLayer):
+    """
+    FileLayer that writes to the file from a background thread, so that slow disk writes don't block the connection.
+    """
+
+    # Layers whose writer thread is still running. Their remaining data is flushed when the interpreter exits.
+    activeLayers: Set['AsyncFileLayer'] = set()
+
+    def __init__(self, fileName: Union[str, Path], maxQueueSize: int = 1024):
+        """
+        :param fileName: name of the file to write to.
+        :param maxQueueSize: maximum number of messages waiting to be written. When the queue is full, sendBytes blocks
+        until the writer thread catches up. Messages are never dropped since that would corrupt the replay, unless
+        writing to the file fails, in which case the recording is abandoned.
+        """
+        super().__init__(fileName)
+        self.queue = queue.Queue(maxQueueSize)
+        self.closed = False
+        self.failed = False
+        self.thread = threading.Thread(target = self.writeQueuedData, daemon = True)
+        AsyncFileLayer.activeLayers.add(self)
+        self.thread.start()
+
+    def sendBytes(self, data: bytes):
+        """
+        Queue data to be written to the file.
+        :param data: data to write.
+        """
+
+        if self.closed:
+            log.error("Recording file handle closed, cannot write message: %(message)s", {"message": data})
+        elif self.failed or not self.thread.is_alive():
+            log.error("Recording file could not be written to, dropping message: %(message)s", {"message": data})
+        else:
+            self.queue.put(data)
+
+    def close(self):
+        """
+        Close the file once the remaining data has been written. This does not wait for the writer thread, which
+        writes the remaining data and closes the file on its own.
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+
+        if not self.thread.is_alive():
+            return
+
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            # The writer thread stops by itself once it has emptied the queue.
+            pass
+
+    @staticmethod
+    def flushAll():
+        """
+        Close every layer and wait until their remaining data is written.
+        Writer threads are daemon threads, so this runs at exit to avoid losing the end of recordings in progress.
+        """
+        for layer in list(AsyncFileLayer.activeLayers):
+            layer.close()
+            layer.thread.join()
+
+    def writeQueuedData(self):
+        """
+        Write queued data to the file until close is called. Runs in the writer thread.
+        If a write fails, the remaining data is discarded so that sendBytes and close never wait on a full queue.
+        """
+        while True:
+            data = self.queue.get()
+
+            if data is None:
+                break
+
+            if not self.failed:
+                try:
+                    FileLayer.sendBytes(self, data)
+                except Exception as e:
+                    log.error("Failed to write to recording file %(fileName)s: %(error)s", {"fileName": self.file_descriptor.name, "error": e})
+                    self.failed = True
+
+            if self.closed and self.queue.empty():
+                break
+
+        try:
+            FileLayer.close(self)
+        except Exception as e:
+            log.error("Failed to close recording file %(fileName)s: %(error)s", {"fileName": self.file_descriptor.name, "error": e})
+        finally:
+            AsyncFileLayer.activeLayers.discard(self)
+
+
+atexit.register(AsyncFileLayer.flushAll)
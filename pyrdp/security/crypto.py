@@ -4,11 +4,14 @@
 # Licensed under the GPLv3 or later.
 #
 
-from Crypto.PublicKey.RSA import RsaKey
-from Crypto.Util.number import bytes_to_long, long_to_bytes
+import hmac
 
-from pyrdp.security import rc4
-from pyrdp.security.key import macData, macSaltedData, generateKeys, updateKey
+from Crypto.Cipher import ARC4
+from Crypto.PublicKey.RSA import RsaKey, construct
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from pyrdp.security.key import generateKeys, macContexts, macDataFromContexts, updateKey
 from pyrdp.enum import EncryptionMethod
 
 """
@@ -25,13 +28,39 @@ class RSA:
     def __init__(self, key: RsaKey):
         self.key = key
 
-    def encrypt(self, plaintext: bytes) -> bytes:
-        m = bytes_to_long(plaintext)
+    @staticmethod
+    def generateKey(bits: int) -> RsaKey:
+        """
+        Generate an RSA private key. Key generation is done by OpenSSL, which is a lot faster than pycryptodome.
+        :param bits: the size of the modulus in bits.
+        """
+        numbers = rsa.generate_private_key(public_exponent = 65537, key_size = bits, backend = default_backend()).private_numbers()
+        return construct((numbers.public_numbers.n, numbers.public_numbers.e, numbers.d, numbers.p, numbers.q))
+
+    @staticmethod
+    def intToBytes(value: int, byteOrder: str) -> bytes:
+        """
+        Convert an integer to the shortest byte string that can hold it.
+        :param value: the integer to convert.
+        :param byteOrder: "big" or "little".
+        """
+        return value.to_bytes(max(1, (value.bit_length() + 7) // 8), byteOrder)
+
+    def encrypt(self, plaintext: bytes, byteOrder: str = "big") -> bytes:
+        """
+        :param plaintext: the data to encrypt.
+        :param byteOrder: byte order of the plaintext and of the returned ciphertext.
+        """
+        m = int.from_bytes(plaintext, byteOrder)
         ciphertext = pow(m, self.key.e, self.key.n)
-        return long_to_bytes(ciphertext)
+        return self.intToBytes(ciphertext, byteOrder)
 
-    def decrypt(self, ciphertext: bytes) -> bytes:
-        c = bytes_to_long(ciphertext)
+    def decrypt(self, ciphertext: bytes, byteOrder: str = "big") -> bytes:
+        """
+        :param ciphertext: the data to decrypt.
+        :param byteOrder: byte order of the ciphertext and of the returned plaintext.
+        """
+        c = int.from_bytes(ciphertext, byteOrder)
 
         # compute c**d (mod n)
         if (hasattr(self.key, 'p') and hasattr(self.key, 'q') and hasattr(self.key, 'u')):
@@ -47,7 +76,7 @@ class RSA:
         else:
             plaintext = pow(c, self.key.d, self.key.n)
 
-        return long_to_bytes(plaintext)
+        return self.intToBytes(plaintext, byteOrder)
 
 class RC4:
     """
@@ -62,9 +91,10 @@ class RC4:
         """
         self.encryptionMethod = encryptionMethod
         self.macKey = macKey
+        self.macSha1Base, self.macMd5Base = macContexts(macKey)
         self.initialBytes = key
         self.currentBytes = key
-        self.key = rc4.RC4Key(key)
+        self.key = ARC4.new(key)
         self.cipherCount = 0
         self.macCount = 0
     
@@ -74,7 +104,7 @@ class RC4:
         :param data: plaintext data to encrypt.
         :return: encrypted data.
         """
-        return rc4.crypt(self.key, data)
+        return self.key.encrypt(data)
     
     def decrypt(self, data: bytes) -> bytes:
         """
@@ -91,10 +121,8 @@ class RC4:
         :param salted: True if the signature should be salted.
         :return: The signature bytes.
         """
-        if salted:
-            return macSaltedData(self.macKey, data, self.macCount)[: 8]
-        else:
-            return macData(self.macKey, data)[: 8]
+        encryptionCount = self.macCount if salted else None
+        return macDataFromContexts(self.macSha1Base, self.macMd5Base, data, encryptionCount)[: 8]
     
     def verify(self, data: bytes, signature: bytes, salted: bool) -> bool:
         """
@@ -104,7 +132,7 @@ class RC4:
         :param salted: True if the signature is salted.
         :return: True if the signature is valid.
         """
-        return signature[: 8] == self.sign(data, salted)
+        return hmac.compare_digest(signature[: 8], self.sign(data, salted))
     
     def increment(self):
         """
@@ -115,7 +143,7 @@ class RC4:
 
         if self.cipherCount == 4096:
             self.currentBytes = updateKey(self.initialBytes, self.currentBytes, self.encryptionMethod)
-            self.key = rc4.RC4Key(self.currentBytes)
+            self.key = ARC4.new(self.currentBytes)
             self.cipherCount = 0
 
 class RC4Crypter:
@@ -18,10 +18,15 @@
 #
 
 import hashlib
+import struct
+
+from Crypto.Cipher import ARC4
 
-from pyrdp.core import ByteStream, Uint32LE
 from pyrdp.enum import EncryptionMethod
-from pyrdp.security import rc4
+
+_MAC_PAD1 = b"\x36" * 40
+_MAC_PAD2 = b"\x5c" * 48
+_PACK_UINT32LE = struct.Struct("<I").pack
 
 
 def saltedHash(inputData, salt, salt1, salt2):
@@ -39,19 +44,35 @@ def saltedHash(inputData, salt, salt1, salt2):
     :type salt2: bytes
     :return: str
     """
-    sha1Digest = hashlib.sha1()
-    md5Digest = hashlib.md5()
+    return saltedHashes([inputData], salt, salt1, salt2)
 
-    sha1Digest.update(inputData)
-    sha1Digest.update(salt[:48])
-    sha1Digest.update(salt1)
-    sha1Digest.update(salt2)
-    sha1Sig = sha1Digest.digest()
 
-    md5Digest.update(salt[:48])
-    md5Digest.update(sha1Sig)
+def saltedHashes(inputs, salt, salt1, salt2):
+    """
+    Generate and concatenate the salted hashes of several inputs that share the same salts.
+    The SHA1 tail salt[:48] + salt1 + salt2 is only built once and appended to each input.
+    The MD5 context seeded with the salt is only built once and copied for each input.
+    :param inputs: list of inputs (ex: [b"A", b"BB", b"CCC"])
+    :type inputs: list[bytes]
+    :param salt: salt for context call
+    :type salt: bytes
+    :param salt1: another salt (ex : client random)
+    :type salt1: bytes
+    :param salt2: another salt (ex: server random)
+    :type salt2: bytes
+    :return: str
+    """
+    salt = salt[:48]
+    sha1Tail = salt + salt1 + salt2
+    md5Base = hashlib.md5(salt)
+    result = []
 
-    return md5Digest.digest()
+    for inputData in inputs:
+        md5Digest = md5Base.copy()
+        md5Digest.update(hashlib.sha1(inputData + sha1Tail).digest())
+        result.append(md5Digest.digest())
+
+    return b"".join(result)
 
 
 def finalHash(key, random1, random2):
@@ -65,11 +86,7 @@ def finalHash(key, random1, random2):
     :type random2: bytes
     :return: MD5(in0[:16] + in1[:32] + in2[:32])
     """
-    md5Digest = hashlib.md5()
-    md5Digest.update(key)
-    md5Digest.update(random1)
-    md5Digest.update(random2)
-    return md5Digest.digest()
+    return hashlib.md5(key + random1 + random2).digest()
 
 
 def generateMasterSecret(preMasterSecret, clientRandom, serverRandom):
@@ -83,7 +100,7 @@ def generateMasterSecret(preMasterSecret, clientRandom, serverRandom):
     :param serverRandom: server random
     :type serverRandom: bytes
     """
-    return saltedHash(b"A", preMasterSecret, clientRandom, serverRandom) + saltedHash(b"BB", preMasterSecret, clientRandom, serverRandom) + saltedHash(b"CCC", preMasterSecret, clientRandom, serverRandom)
+    return saltedHashes([b"A", b"BB", b"CCC"], preMasterSecret, clientRandom, serverRandom)
 
 
 def generateSessionKeyBlob(masterSecret, clientRandom, serverRandom):
@@ -96,39 +113,57 @@ def generateSessionKeyBlob(masterSecret, clientRandom, serverRandom):
     :param serverRandom: server random
     :type serverRandom: bytes
     """
-    return saltedHash(b"X", masterSecret, clientRandom, serverRandom) + saltedHash(b"YY", masterSecret, clientRandom, serverRandom) + saltedHash(b"ZZZ", masterSecret, clientRandom, serverRandom)
+    return saltedHashes([b"X", b"YY", b"ZZZ"], masterSecret, clientRandom, serverRandom)
 
 
-def macData(macKey, data):
+def macContexts(macKey):
     """
-    Generate an unsalted signature.
-    See: http://msdn.microsoft.com/en-us/library/cc241995.aspx
+    Create the SHA1 and MD5 contexts that every signature made with a signing key starts from.
+    They can be copied for each message instead of hashing the key and pads again.
     :param macKey: signing key.
     :type macKey: bytes
+    :return: hashlib.sha1, hashlib.md5
+    """
+    return hashlib.sha1(macKey + _MAC_PAD1), hashlib.md5(macKey + _MAC_PAD2)
+
+
+def macDataFromContexts(sha1Base, md5Base, data, encryptionCount = None):
+    """
+    Generate a signature from contexts created by macContexts.
+    :param sha1Base: SHA1 context of the signing key.
+    :param md5Base: MD5 context of the signing key.
     :param data: data to sign.
     :type data: bytes
+    :param encryptionCount: the number of encrypted packets so far, or None for an unsalted signature.
+    :type encryptionCount: int
     :return: str
     """
-    sha1Digest = hashlib.sha1()
-    md5Digest = hashlib.md5()
-
-    dataLength = ByteStream()
-    Uint32LE.pack(len(data), dataLength)
-
-    sha1Digest.update(macKey)
-    sha1Digest.update(b"\x36" * 40)
-    sha1Digest.update(dataLength.getvalue())
+    sha1Digest = sha1Base.copy()
+    sha1Digest.update(_PACK_UINT32LE(len(data)))
     sha1Digest.update(data)
 
-    sha1Sig = sha1Digest.digest()
-
-    md5Digest.update(macKey)
-    md5Digest.update(b"\x5c" * 48)
-    md5Digest.update(sha1Sig)
+    if encryptionCount is not None:
+        sha1Digest.update(_PACK_UINT32LE(encryptionCount))
 
+    md5Digest = md5Base.copy()
+    md5Digest.update(sha1Digest.digest())
     return md5Digest.digest()
 
 
+def macData(macKey, data):
+    """
+    Generate an unsalted signature.
+    See: http://msdn.microsoft.com/en-us/library/cc241995.aspx
+    :param macKey: signing key.
+    :type macKey: bytes
+    :param data: data to sign.
+    :type data: bytes
+    :return: str
+    """
+    sha1Base, md5Base = macContexts(macKey)
+    return macDataFromContexts(sha1Base, md5Base, data)
+
+
 def macSaltedData(macKey, data, encryptionCount):
     """
     Generate a salted signature.
@@ -141,28 +176,8 @@ def macSaltedData(macKey, data, encryptionCount):
     :type encryptionCount: int
     :return: str
     """
-    sha1Digest = hashlib.sha1()
-    md5Digest = hashlib.md5()
-
-    dataLengthS = ByteStream()
-    Uint32LE.pack(len(data), dataLengthS)
-
-    encryptionCountS = ByteStream()
-    Uint32LE.pack(encryptionCount, encryptionCountS)
-
-    sha1Digest.update(macKey)
-    sha1Digest.update(b"\x36" * 40)
-    sha1Digest.update(dataLengthS.getvalue())
-    sha1Digest.update(data)
-    sha1Digest.update(encryptionCountS.getvalue())
-
-    sha1Sig = sha1Digest.digest()
-
-    md5Digest.update(macKey)
-    md5Digest.update(b"\x5c" * 48)
-    md5Digest.update(sha1Sig)
-
-    return md5Digest.digest()
+    sha1Base, md5Base = macContexts(macKey)
+    return macDataFromContexts(sha1Base, md5Base, data, encryptionCount)
 
 
 def tempKey(initialKey, currentKey):
@@ -177,13 +192,13 @@ def tempKey(initialKey, currentKey):
     md5Digest = hashlib.md5()
 
     sha1Digest.update(initialKey)
-    sha1Digest.update(b"\x36" * 40)
+    sha1Digest.update(_MAC_PAD1)
     sha1Digest.update(currentKey)
 
     sha1Sig = sha1Digest.digest()
 
     md5Digest.update(initialKey)
-    md5Digest.update(b"\x5c" * 48)
+    md5Digest.update(_MAC_PAD2)
     md5Digest.update(sha1Sig)
 
     return md5Digest.digest()
@@ -255,10 +270,10 @@ def updateKey(initialKey, currentKey, method):
     """
     if method == EncryptionMethod.ENCRYPTION_40BIT:
         tempKey128 = tempKey(initialKey[:8], currentKey[:8])
-        return gen40bits(rc4.crypt(rc4.RC4Key(tempKey128[:8]), tempKey128[:8]))
+        return gen40bits(ARC4.new(tempKey128[:8]).encrypt(tempKey128[:8]))
     elif method == EncryptionMethod.ENCRYPTION_56BIT:
         tempKey128 = tempKey(initialKey[:8], currentKey[:8])
-        return gen56bits(rc4.crypt(rc4.RC4Key(tempKey128[:8]), tempKey128[:8]))
+        return gen56bits(ARC4.new(tempKey128[:8]).encrypt(tempKey128[:8]))
     elif method == EncryptionMethod.ENCRYPTION_128BIT:
         tempKey128 = tempKey(initialKey, currentKey)
-        return rc4.crypt(rc4.RC4Key(tempKey128), tempKey128)
\ No newline at end of file
+        return ARC4.new(tempKey128).encrypt(tempKey128)
\ No newline at end of file
@@ -4,7 +4,8 @@
 # Licensed under the GPLv3 or later.
 #
 
-import Crypto.Random
+import os
+
 from Crypto.PublicKey.RSA import RsaKey
 
 from pyrdp.core import ObservedBy, Observer, Subject
@@ -55,20 +56,20 @@ class SecuritySettings(Subject):
         """
         Generate client random data.
         """
-        self.setClientRandom(Crypto.Random.get_random_bytes(32))
+        self.setClientRandom(os.urandom(32))
 
     def generateServerRandom(self):
         """
         Generate server random data.
         """
-        self.setServerRandom(Crypto.Random.get_random_bytes(32))
+        self.setServerRandom(os.urandom(32))
 
     def encryptClientRandom(self) -> bytes:
         """
         Encrypt the client random using the public key.
         """
-        # plaintext is stored as little-endian but crypto functions expect it to be in big-endian format.
-        return RSA(self.serverPublicKey).encrypt(self.clientRandom[:: -1])[:: -1]
+        # The client random and the encrypted client random are stored in little-endian format.
+        return RSA(self.serverPublicKey).encrypt(self.clientRandom, "little")
 
 
     def setEncryptionMethod(self, encryptionMethod: EncryptionMethod):
@@ -24,17 +24,26 @@ Qt specific code
 QRemoteDesktop is a widget use for render in rdpy
 """
 
-from io import BytesIO
+from typing import Iterable, Optional, Tuple, Union
 
 import rle
-from PySide2.QtCore import QEvent, QPoint, Signal
-from PySide2.QtGui import QColor, QImage, QMatrix, QPainter
+from PySide2.QtCore import QPoint, QRect, Qt, QTimer, Signal
+from PySide2.QtGui import QColor, QImage, QPainter, QPaintEvent, QRegion
 from PySide2.QtWidgets import QWidget
 
 from pyrdp.logging import log
 
 
-def RDPBitmapToQtImage(width: int, height: int, bitsPerPixel: int, isCompressed: bool, data: bytes):
+# Qt image format and number of bytes per pixel for each bitmap color depth that Qt can display directly.
+BITMAP_FORMATS = {
+    15: (QImage.Format_RGB555, 2),
+    16: (QImage.Format_RGB16, 2),
+    24: (QImage.Format_RGB888, 3),
+    32: (QImage.Format_RGB32, 4),
+}
+
+
+def RDPBitmapToQtImage(width: int, height: int, bitsPerPixel: int, isCompressed: bool, data: bytes, buffer: Optional[bytearray] = None):
     """
     Bitmap transformation to Qt object
     :param width: width of bitmap
@@ -42,63 +51,52 @@ def RDPBitmapToQtImage(width: int, height: int, bitsPerPixel: int, isCompressed:
     :param bitsPerPixel: number of bit per pixel
     :param isCompressed: use RLE compression
     :param data: bitmap data
+    :param buffer: buffer to decompress the bitmap into, to avoid allocating one for each bitmap (optional).
+    The returned image uses this buffer directly, so it must not be reused while the image is alive.
+    Uncompressed bitmaps are stored bottom-up. They are flipped with QImage.mirrored, which copies whole scanlines
+    instead of going through a generic transformation.
     """
-    image = None
-    
-    if bitsPerPixel == 15:
-        if isCompressed:
-            buf = bytearray(width * height * 2)
-            rle.bitmap_decompress(buf, width, height, data, 2)
-            image = QImage(buf, width, height, QImage.Format_RGB555)
-        else:
-            image = QImage(data, width, height, QImage.Format_RGB555).transformed(QMatrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0))
-    
-    elif bitsPerPixel == 16:
-        if isCompressed:
-            buf = bytearray(width * height * 2)
-            rle.bitmap_decompress(buf, width, height, data, 2)
-            image = QImage(buf, width, height, QImage.Format_RGB16)
-        else:
-            image = QImage(data, width, height, QImage.Format_RGB16).transformed(QMatrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0))
-    
-    elif bitsPerPixel == 24:
+    if bitsPerPixel == 8:
         if isCompressed:
-            buf = bytearray(width * height * 3)
-            rle.bitmap_decompress(buf, width, height, data, 3)
-
-            # This is a ugly patch because there is a bug in the 24bpp decompression in rle.c
-            # where the red and the blue colors are inverted. Fixing this in python causes a performance
-            # issue, but at least it shows the good colors.
-            buf2 = BytesIO(buf)
-            while buf2.tell() < len(buf2.getvalue()):
-                pixel = buf2.read(3)
-                buf[buf2.tell() - 3] = pixel[2]
-                buf[buf2.tell() - 1] = pixel[0]
-
-            image = QImage(buf, width, height, QImage.Format_RGB888)
-        else:
-            image = QImage(data, width, height, QImage.Format_RGB888).transformed(QMatrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0))
-            
-    elif bitsPerPixel == 32:
-        if isCompressed:
-            buf = bytearray(width * height * 4)
-            rle.bitmap_decompress(buf, width, height, data, 4)
-            image = QImage(buf, width, height, QImage.Format_RGB32)
-        else:
-            image = QImage(data, width, height, QImage.Format_RGB32).transformed(QMatrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0))
-    elif bitsPerPixel == 8:
-        if isCompressed:
-            buf = bytearray(width * height * 1)
+            buf = getDecompressionBuffer(buffer, width * height * 1)
             rle.bitmap_decompress(buf, width, height, data, 1)
-            buf2 = convert8bppTo16bpp(buf)
-            image = QImage(buf2, width, height, QImage.Format_RGB16)
+            buf2 = convert8bppTo16bpp(buf[: width * height])
+            return QImage(buf2, width, height, QImage.Format_RGB16)
         else:
             buf2 = convert8bppTo16bpp(data)
-            image = QImage(buf2, width, height, QImage.Format_RGB16).transformed(QMatrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0))
-    else:
+            return QImage(buf2, width, height, QImage.Format_RGB16).mirrored(False, True)
+
+    if bitsPerPixel not in BITMAP_FORMATS:
         log.error("Receive image in bad format")
-        image = QImage(width, height, QImage.Format_RGB32)
-    return image
+        return QImage(width, height, QImage.Format_RGB32)
+
+    imageFormat, bytesPerPixel = BITMAP_FORMATS[bitsPerPixel]
+
+    if isCompressed:
+        # For 24bpp bitmaps, rle.c swaps the red and blue channels after decompression.
+        buf = getDecompressionBuffer(buffer, width * height * bytesPerPixel)
+        rle.bitmap_decompress(buf, width, height, data, bytesPerPixel)
+        return QImage(buf, width, height, imageFormat)
+    else:
+        return QImage(data, width, height, imageFormat).mirrored(False, True)
+
+
+def getDecompressionBuffer(buffer: Optional[bytearray], size: int) -> bytearray:
+    """
+    Get a buffer large enough to hold a decompressed bitmap.
+    :param buffer: buffer to reuse if it is large enough (optional)
+    :param size: size of the decompressed bitmap
+    """
+    if buffer is not None and len(buffer) >= size:
+        return buffer
+
+    return bytearray(size)
+
+
+# Lookup tables mapping each 8bpp index to the low and high bytes of its RGB16 color.
+# The index is split as RRGGGBBB, and each component is stored in the upper bits of the RGB16 fields.
+_8BPP_TO_16BPP_LOW = bytes((pixel & 0b00000111) << 3 for pixel in range(256))
+_8BPP_TO_16BPP_HIGH = bytes(((pixel & 0b00111000) >> 3) | (((pixel & 0b11000000) >> 6) << 5) for pixel in range(256))
 
 
 def convert8bppTo16bpp(buf: bytes):
@@ -106,17 +104,11 @@ def convert8bppTo16bpp(buf: bytes):
     WARNING: The actual 8bpp images work by using a color palette, which this method does not use.
     This method instead tries to transform indices into colors. This results in a weird looking image,
     but it can still be useful to see whats happening ¯\_(ツ)_/¯
+    The conversion is done with bytes.translate and slice assignments, so there is no per-pixel Python code.
     """
     buf2 = bytearray(len(buf) * 2)
-    i = 0
-    for pixel in buf:
-        r = (pixel & 0b11000000) >> 6
-        g = (pixel & 0b00111000) >> 3
-        b = (pixel & 0b00000111) >> 0
-        buf2[i] = (b << 3)
-        buf2[i + 1] = (g << 0) | (r << 5)
-        i += 2
-
+    buf2[0::2] = buf.translate(_8BPP_TO_16BPP_LOW)
+    buf2[1::2] = buf.translate(_8BPP_TO_16BPP_HIGH)
     return buf2
 
 
@@ -127,6 +119,12 @@ class QRemoteDesktop(QWidget):
     # This signal can be used by other objects to run code on the main thread. The argument is a callable.
     mainThreadHook = Signal(object)
 
+    # Radius of the circle drawn at the mouse position.
+    MOUSE_RADIUS = 5
+
+    # Minimum time between two repaints, in milliseconds (caps the widget at ~15 fps).
+    REFRESH_INTERVAL = 66
+
     def __init__(self, width: int, height: int, parent: QWidget = None):
         """
         :param width: width of widget
@@ -134,14 +132,21 @@ class QRemoteDesktop(QWidget):
         :param parent: parent widget
         """
         super().__init__(parent)
-        #set correct size
+        #set correct size, this also creates the buffer image
         self.resize(width, height)
         #bind mouse event
         self.setMouseTracking(True)
-        #buffer image
-        self._buffer = QImage(width, height, QImage.Format_RGB32)
         self.mouseX = width // 2
         self.mouseY = height // 2
+        self._mouseColor = QColor.fromRgb(255, 255, 0, 180)
+        #the same painter is used for every paint operation, on the buffer or on the widget
+        self._painter = QPainter()
+        #areas to repaint on the next refresh
+        self._dirtyRegion = QRegion()
+        self._refreshTimer = QTimer(self)
+        self._refreshTimer.setSingleShot(True)
+        self._refreshTimer.setInterval(QRemoteDesktop.REFRESH_INTERVAL)
+        self._refreshTimer.timeout.connect(self.refresh)
 
         self.mainThreadHook.connect(self.runOnMainThread)
 
@@ -149,6 +154,18 @@ class QRemoteDesktop(QWidget):
     def runOnMainThread(self, target: callable):
         target()
 
+    @staticmethod
+    def createBuffer(width: int, height: int) -> QImage:
+        """
+        Create an opaque image to draw bitmaps on.
+        The buffer has no alpha channel: 32bpp bitmaps are drawn as RGB32 with an undefined fourth byte, which would
+        otherwise be copied as-is into the buffer's alpha.
+        :param width: width of the buffer
+        :param height: height of the buffer
+        """
+        buffer = QImage(width, height, QImage.Format_RGB32)
+        buffer.fill(Qt.black)
+        return buffer
 
     def notifyImage(self, x: int, y: int, qimage: QImage, width: int, height: int):
         """
@@ -159,18 +176,67 @@ class QRemoteDesktop(QWidget):
         :param width: width of the new image
         :param height: height of the new image
         """
+        self.notifyImages([(x, y, qimage, width, height)])
+
+    def notifyImages(self, images: Iterable[Tuple[int, int, QImage, int, int]]):
+        """
+        Draw several images on the buffer with a single painter, and schedule one repaint that covers all of them.
+        Each image is drawn as soon as it is taken from the iterable, so a generator can reuse the same memory for
+        consecutive images.
+        :param images: (x, y, QImage, width, height) tuples for each new image
+        """
 
         #fill buffer image
-        qp = QPainter(self._buffer)
-        qp.drawImage(x, y, qimage, 0, 0, width, height)
+        dirtyRegion = QRegion()
+        qp = self._painter
+        qp.begin(self._buffer)
+
+        # Decoding an image can raise, the painter must be released on the buffer no matter what.
+        try:
+            for x, y, qimage, width, height in images:
+                qp.drawImage(x, y, qimage, 0, 0, width, height)
+                dirtyRegion = dirtyRegion.united(QRect(x, y, width, height))
+        finally:
+            qp.end()
 
-        #force update
-        self.update()
+            #only repaint the area covered by the new images
+            self.scheduleUpdate(dirtyRegion)
 
     def setMousePosition(self, x: int, y: int):
+        self.scheduleUpdate(self.getMouseRect())
         self.mouseX = x
         self.mouseY = y
-        self.update()
+        self.scheduleUpdate(self.getMouseRect())
+
+    def scheduleUpdate(self, area: Union[QRect, QRegion]):
+        """
+        Mark an area of the widget as dirty. Dirty areas are repainted together at most once per refresh interval,
+        no matter how many updates are received in the meantime.
+        :param area: the area to repaint
+        """
+        self._dirtyRegion = self._dirtyRegion.united(area)
+
+        if not self._refreshTimer.isActive():
+            self._refreshTimer.start()
+
+    def refresh(self):
+        """
+        Repaint all the areas that changed since the last refresh.
+        """
+        region = self._dirtyRegion
+
+        if region.isEmpty():
+            return
+
+        self._dirtyRegion = QRegion()
+        self.update(region)
+
+    def getMouseRect(self) -> QRect:
+        """
+        Get the area of the widget covered by the mouse cursor.
+        """
+        radius = QRemoteDesktop.MOUSE_RADIUS + 2
+        return QRect(self.mouseX - radius, self.mouseY - radius, radius * 2 + 1, radius * 2 + 1)
 
     def resize(self, width: int, height: int):
         """
@@ -178,20 +244,27 @@ class QRemoteDesktop(QWidget):
         :param width: new width of the widget
         :param height: new height of the widget
         """
-        self._buffer = QImage(width, height, QImage.Format_RGB32)
+        self._buffer = self.createBuffer(width, height)
         super().resize(width, height)
 
-    def paintEvent(self, e: QEvent):
+    def paintEvent(self, e: QPaintEvent):
         """
         Call when Qt renderer engine estimate that is needed
         :param e: the event
         """
-        qp = QPainter(self)
-        qp.drawImage(0, 0, self._buffer)
-        qp.setBrush(QColor.fromRgb(255, 255, 0, 180))
-        qp.drawEllipse(QPoint(self.mouseX, self.mouseY), 5, 5)
+        # Only the bounding rectangle of the dirty areas needs to be drawn.
+        rect = e.rect()
+        qp = self._painter
+        qp.begin(self)
+
+        try:
+            qp.drawImage(rect, self._buffer, rect)
+            qp.setBrush(self._mouseColor)
+            qp.drawEllipse(QPoint(self.mouseX, self.mouseY), QRemoteDesktop.MOUSE_RADIUS, QRemoteDesktop.MOUSE_RADIUS)
+        finally:
+            qp.end()
 
     def clear(self):
-        self._buffer = QImage(self._buffer.width(), self._buffer.height(), QImage.Format_RGB32)
+        self._buffer = self.createBuffer(self._buffer.width(), self._buffer.height())
         self.setMousePosition(self._buffer.width() // 2, self._buffer.height() // 2)
         self.repaint()
\ No newline at end of file